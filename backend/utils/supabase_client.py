@@ -5,32 +5,217 @@ Provides connection to Supabase with helper methods for:
 - Vector search
 - Hybrid search
 - Segment insertion/updates
+
+AsyncSupabaseClient mirrors the read/search API for asyncio callers
+(e.g. FastAPI handlers fanning out several searches at once).
 """
 
+import asyncio
 import os
-from typing import List, Dict, Optional, Any
-from supabase import create_client, Client
+import threading
+from typing import List, Dict, Optional, Any, Tuple
+import httpx
+import orjson
+from supabase import (
+    create_client, acreate_client, Client, AsyncClient, ClientOptions, AsyncClientOptions
+)
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
 from dotenv import load_dotenv
 import numpy as np
 
 # Load environment variables
 load_dotenv()
 
+# Default projection for segment reads: everything but the embedding
+SEGMENT_COLUMNS = "segment_id,interview_id,speaker_role,start_time,end_time,text,confidence"
+
+# Connection pool shared by all requests; HTTP/2 multiplexes concurrent
+# RPCs over warm connections instead of opening new TCP/TLS sessions.
+# supabase-py ignores postgrest_client_timeout when given an httpx client,
+# so the timeout must be set on the client itself (httpx defaults to 5s).
+# supabase-py (2.16+) also hands this client to auth, storage and functions,
+# while postgrest-py rewrites its base_url and merges in its headers. Only use
+# the PostgREST side (table()/rpc()) of these clients; self.client.storage and
+# self.client.functions would send requests to the PostgREST URL.
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+POSTGREST_TIMEOUT = httpx.Timeout(30.0)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Rows per insert request; keeps request bodies small and isolates failures
+DEFAULT_BATCH_SIZE = 500
+
+
+class PartialInsertError(Exception):
+    """
+    A chunked insert failed after earlier chunks were committed.
+    
+    Each chunk is its own request and transaction, so `inserted` rows are
+    already stored; retry with segments[inserted:] to resume.
+    """
+    
+    def __init__(self, inserted: int, total: int, cause: Exception):
+        super().__init__(f"Inserted {inserted} of {total} segments before failure: {cause}")
+        self.inserted = inserted
+
+
+def _normalize(embedding: List[float]) -> np.ndarray:
+    """
+    Scale an embedding to unit length.
+    
+    Stored and query vectors are unit-normalized so the database can rank by
+    inner product (halfvec_ip_ops / <#>), which equals cosine similarity here.
+    """
+    vec = np.asarray(embedding, dtype=np.float32)
+    return vec / (np.linalg.norm(vec) + 1e-12)
+
+
+def _fmt_vec(embedding: List[float]) -> str:
+    """
+    Format a unit-normalized embedding as a compact pgvector text literal.
+    
+    Sent instead of a JSON float array so PostgREST passes one string through
+    rather than re-encoding 768 numbers before the cast to halfvec.
+    """
+    values = _normalize(embedding).tolist()
+    return "[" + ",".join(f"{x:.6g}" for x in values) + "]"
+
+
+def _with_unit_embedding(segment: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a segment row with its embedding unit-normalized."""
+    if segment.get("embedding") is None:
+        return segment
+    return {**segment, "embedding": _normalize(segment["embedding"]).tolist()}
+
+
+def _chunks(items: List[Any], size: int):
+    """Yield successive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _credentials() -> Tuple[str, str]:
+    """Read Supabase URL and service role key from the environment."""
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    
+    if not url or not key:
+        raise ValueError(
+            "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment"
+        )
+    
+    return url, key
+
+
+def _rpc_error(response: httpx.Response) -> APIError:
+    """
+    Build an APIError from a failed RPC response.
+    
+    Gateway errors (502/504) can return HTML rather than PostgREST's JSON
+    error body, so fall back to the raw text and status code.
+    """
+    try:
+        return APIError(orjson.loads(response.content))
+    except orjson.JSONDecodeError:
+        return APIError({"message": response.text, "code": str(response.status_code)})
+
+
+def _with_index_params(
+    function: str,
+    params: Dict[str, Any],
+    ef_search: Optional[int],
+    probes: Optional[int]
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Route to the *_tuned plpgsql wrapper only when an index knob is set.
+    
+    The plain search functions are single-statement SQL; setting
+    ef_search/probes needs the plpgsql wrapper and its extra call overhead.
+    """
+    if ef_search is None and probes is None:
+        return function, params
+    return f"{function}_tuned", {**params, "ef_search": ef_search, "probes": probes}
+
+
+def _semantic_search_rpc(
+    query_embedding: List[float],
+    match_threshold: float,
+    match_count: int,
+    filter_interview_id: Optional[str],
+    filter_speaker_role: Optional[str],
+    ef_search: Optional[int],
+    probes: Optional[int]
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the search_segments RPC name and payload."""
+    params = {
+        "query_embedding": _fmt_vec(query_embedding),
+        "match_threshold": match_threshold,
+        "match_count": match_count,
+        "filter_interview_id": filter_interview_id,
+        "filter_speaker_role": filter_speaker_role
+    }
+    return _with_index_params("search_segments", params, ef_search, probes)
+
+
+def _hybrid_search_rpc(
+    query_embedding: List[float],
+    query_text: str,
+    semantic_weight: float,
+    keyword_weight: float,
+    match_count: int,
+    filter_interview_id: Optional[str],
+    filter_speaker_role: Optional[str],
+    ef_search: Optional[int],
+    probes: Optional[int],
+    rrf_k: int
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the hybrid_search_segments RPC name and payload."""
+    params = {
+        "query_embedding": _fmt_vec(query_embedding),
+        "query_text": query_text,
+        "semantic_weight": semantic_weight,
+        "keyword_weight": keyword_weight,
+        "match_count": match_count,
+        "filter_interview_id": filter_interview_id,
+        "filter_speaker_role": filter_speaker_role,
+        "rrf_k": rrf_k
+    }
+    return _with_index_params("hybrid_search_segments", params, ef_search, probes)
+
 
 class SupabaseClient:
     """Wrapper for Supabase operations."""
     
     def __init__(self):
         """Initialize Supabase client."""
-        url = os.getenv("SUPABASE_URL")
-        key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        
-        if not url or not key:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment"
+        url, key = _credentials()
+        self._http = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=POSTGREST_TIMEOUT)
+        self.client: Client = create_client(
+            url,
+            key,
+            options=ClientOptions(
+                httpx_client=self._http,
+                schema="public"
             )
+        )
+        # Hot paths reuse these instead of rebuilding request builders per call
+        self._segments_table = self.client.table("segments")
+        self._rpc_session = self.client.postgrest.session
+    
+    def _post_rpc(self, function: str, params: Dict[str, Any]) -> Any:
+        """
+        Call an RPC with an orjson-encoded body, bypassing the query builder.
         
-        self.client: Client = create_client(url, key)
+        Raises:
+            APIError: If PostgREST returns an error response
+        """
+        response = self._rpc_session.post(
+            f"/rpc/{function}", content=orjson.dumps(params), headers=JSON_HEADERS
+        )
+        if not response.is_success:
+            raise _rpc_error(response)
+        return orjson.loads(response.content)
     
     def insert_segment(self, segment: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -42,21 +227,143 @@ class SupabaseClient:
         Returns:
             Inserted segment data
         """
-        result = self.client.table("segments").insert(segment).execute()
+        result = self._segments_table.insert(
+            _with_unit_embedding(segment), returning=ReturnMethod.representation
+        ).execute()
         return result.data[0] if result.data else None
     
-    def batch_insert_segments(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def batch_insert_segments(
+        self,
+        segments: List[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
         """
-        Insert multiple segments in a batch.
+        Insert multiple segments in batches of `chunk_size`.
+        
+        Rows are not sent back (Prefer: return=minimal), which avoids
+        echoing every embedding over the wire; use insert_segment when the
+        generated segment_id is needed.
         
         Args:
             segments: List of segment dictionaries
+            chunk_size: Maximum rows per insert request
             
         Returns:
-            List of inserted segment data
+            Number of rows inserted
+            
+        Raises:
+            PartialInsertError: If a chunk fails; earlier chunks stay committed
         """
-        result = self.client.table("segments").insert(segments).execute()
-        return result.data
+        total = 0
+        for chunk in _chunks(segments, chunk_size):
+            rows = [_with_unit_embedding(seg) for seg in chunk]
+            try:
+                self._segments_table.insert(rows, returning=ReturnMethod.minimal).execute()
+            except (APIError, httpx.HTTPError) as e:
+                raise PartialInsertError(total, len(segments), e) from e
+            total += len(rows)
+        return total
+    
+    def bulk_insert_segments(
+        self,
+        segments: List[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BATCH_SIZE
+    ) -> int:
+        """
+        Insert segments through the insert_segments_bulk RPC (server-side UNNEST).
+        
+        Faster than batch_insert_segments for large ingests since each chunk
+        is a single multi-row INSERT executed server-side.
+        
+        Args:
+            segments: List of segment dictionaries
+            chunk_size: Maximum rows per RPC call
+            
+        Returns:
+            Number of rows inserted
+            
+        Raises:
+            PartialInsertError: If a chunk fails; earlier chunks stay committed
+        """
+        total = 0
+        for chunk in _chunks(segments, chunk_size):
+            try:
+                inserted = self._post_rpc(
+                    "insert_segments_bulk",
+                    {
+                        "interview_ids": [seg.get("interview_id") for seg in chunk],
+                        "speaker_roles": [seg.get("speaker_role") for seg in chunk],
+                        "start_times": [seg["start_time"] for seg in chunk],
+                        "end_times": [seg["end_time"] for seg in chunk],
+                        "texts": [seg["text"] for seg in chunk],
+                        "embeddings": [
+                            _fmt_vec(seg["embedding"]) if seg.get("embedding") is not None else None
+                            for seg in chunk
+                        ],
+                        "confidences": [seg.get("confidence") for seg in chunk],
+                        "ingestion_modes": [seg.get("ingestion_mode") for seg in chunk],
+                        "metadatas": [seg.get("metadata") for seg in chunk]
+                    }
+                )
+            except (APIError, httpx.HTTPError) as e:
+                raise PartialInsertError(total, len(segments), e) from e
+            total += inserted
+        return total
+    
+    def copy_insert_segments(self, segments: List[Dict[str, Any]]) -> int:
+        """
+        Insert segments with binary COPY over a direct Postgres connection.
+        
+        Bypasses PostgREST entirely: embeddings are sent as raw halfvec bytes
+        with no JSON encoding or text parsing. Needs DATABASE_URL and the
+        optional psycopg[binary] and pgvector packages.
+        
+        Args:
+            segments: List of segment dictionaries
+            
+        Returns:
+            Number of rows inserted
+        """
+        try:
+            import psycopg
+            from psycopg.types.json import Jsonb
+            from pgvector import HalfVector
+            from pgvector.psycopg import register_vector
+        except ImportError as e:
+            raise ImportError(
+                "copy_insert_segments requires psycopg[binary] and pgvector"
+            ) from e
+        
+        dsn = os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("DATABASE_URL must be set in environment")
+        
+        with psycopg.connect(dsn) as conn:
+            register_vector(conn)
+            with conn.cursor() as cur, cur.copy(
+                "COPY segments (interview_id, speaker_role, start_time, end_time, text, "
+                "embedding, confidence, ingestion_mode, metadata) FROM STDIN WITH (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types([
+                    "varchar", "varchar", "float8", "float8", "text",
+                    "halfvec", "float8", "varchar", "jsonb"
+                ])
+                for seg in segments:
+                    embedding = seg.get("embedding")
+                    metadata = seg.get("metadata")
+                    copy.write_row((
+                        seg.get("interview_id"),
+                        seg.get("speaker_role"),
+                        seg["start_time"],
+                        seg["end_time"],
+                        seg["text"],
+                        HalfVector(_normalize(embedding).astype(np.float16)) if embedding is not None else None,
+                        seg.get("confidence"),
+                        seg.get("ingestion_mode"),
+                        Jsonb(metadata) if metadata is not None else None
+                    ))
+        
+        return len(segments)
     
     def upsert_segment(self, segment: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -68,7 +375,7 @@ class SupabaseClient:
         Returns:
             Upserted segment data
         """
-        result = self.client.table("segments").upsert(segment).execute()
+        result = self._segments_table.upsert(_with_unit_embedding(segment)).execute()
         return result.data[0] if result.data else None
     
     def semantic_search(
@@ -77,7 +384,9 @@ class SupabaseClient:
         match_threshold: float = 0.3,
         match_count: int = 10,
         filter_interview_id: Optional[str] = None,
-        filter_speaker_role: Optional[str] = None
+        filter_speaker_role: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic vector search.
@@ -88,22 +397,57 @@ class SupabaseClient:
             match_count: Number of results
             filter_interview_id: Optional interview filter
             filter_speaker_role: Optional speaker filter (PATIENT/CLINICIAN)
+            ef_search: Optional HNSW candidate list size for this query
+                (higher = better recall, slower; pgvector default is 40)
+            probes: Optional IVFFlat lists to scan when the index is IVFFlat
+                (higher = better recall, slower; pgvector default is 1)
             
         Returns:
             List of matching segments with similarity scores
         """
-        result = self.client.rpc(
-            "search_segments",
+        return self._post_rpc(
+            *_semantic_search_rpc(
+                query_embedding, match_threshold, match_count,
+                filter_interview_id, filter_speaker_role, ef_search, probes
+            )
+        )
+    
+    def semantic_search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        match_threshold: float = 0.3,
+        match_count: int = 10,
+        filter_interview_id: Optional[str] = None,
+        filter_speaker_role: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Perform several semantic searches in a single RPC call.
+        
+        Args:
+            query_embeddings: Query vectors (768-dim each)
+            match_threshold: Minimum similarity score
+            match_count: Number of results per query
+            filter_interview_id: Optional interview filter
+            filter_speaker_role: Optional speaker filter (PATIENT/CLINICIAN)
+            
+        Returns:
+            One list of matching segments per query, in input order
+        """
+        rows = self._post_rpc(
+            "search_segments_batch",
             {
-                "query_embedding": query_embedding,
+                "query_embeddings": [_fmt_vec(q) for q in query_embeddings],
                 "match_threshold": match_threshold,
                 "match_count": match_count,
                 "filter_interview_id": filter_interview_id,
                 "filter_speaker_role": filter_speaker_role
             }
-        ).execute()
+        )
         
-        return result.data
+        grouped: List[List[Dict[str, Any]]] = [[] for _ in query_embeddings]
+        for row in rows:
+            grouped[row.pop("query_index")].append(row)
+        return grouped
     
     def hybrid_search(
         self,
@@ -113,54 +457,59 @@ class SupabaseClient:
         keyword_weight: float = 0.3,
         match_count: int = 10,
         filter_interview_id: Optional[str] = None,
-        filter_speaker_role: Optional[str] = None
+        filter_speaker_role: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        rrf_k: int = 60
     ) -> List[Dict[str, Any]]:
         """
         Perform hybrid search (semantic + keyword).
         
+        Results are fused with Reciprocal Rank Fusion, so the weights scale
+        each retriever's 1/(rrf_k + rank) term rather than its raw score.
+        
         Args:
             query_embedding: Query vector
             query_text: Query text for keyword matching
-            semantic_weight: Weight for semantic score
-            keyword_weight: Weight for keyword score
+            semantic_weight: Weight for the semantic RRF term
+            keyword_weight: Weight for the keyword RRF term
             match_count: Number of results
             filter_interview_id: Optional interview filter
             filter_speaker_role: Optional speaker filter
+            ef_search: Optional HNSW candidate list size for this query
+            probes: Optional IVFFlat lists to scan for this query
+            rrf_k: RRF rank offset (larger = flatter rank weighting)
             
         Returns:
-            List of matching segments with combined scores
+            List of matching segments with RRF combined scores
         """
-        result = self.client.rpc(
-            "hybrid_search_segments",
-            {
-                "query_embedding": query_embedding,
-                "query_text": query_text,
-                "semantic_weight": semantic_weight,
-                "keyword_weight": keyword_weight,
-                "match_count": match_count,
-                "filter_interview_id": filter_interview_id,
-                "filter_speaker_role": filter_speaker_role
-            }
-        ).execute()
-        
-        return result.data
+        return self._post_rpc(
+            *_hybrid_search_rpc(
+                query_embedding, query_text, semantic_weight, keyword_weight,
+                match_count, filter_interview_id, filter_speaker_role, ef_search, probes,
+                rrf_k
+            )
+        )
     
     def get_segments_by_interview(
         self,
         interview_id: str,
-        speaker_role: Optional[str] = None
+        speaker_role: Optional[str] = None,
+        columns: str = SEGMENT_COLUMNS
     ) -> List[Dict[str, Any]]:
         """
-        Get all segments for an interview.
+        Get all segments for an interview, ordered by start time.
         
         Args:
             interview_id: Interview identifier
             speaker_role: Optional speaker filter
+            columns: Comma-separated columns to return; the default omits
+                the embedding ("*" to fetch everything)
             
         Returns:
             List of segments
         """
-        query = self.client.table("segments").select("*").eq("interview_id", interview_id)
+        query = self._segments_table.select(columns).eq("interview_id", interview_id)
         
         if speaker_role:
             query = query.eq("speaker_role", speaker_role)
@@ -181,28 +530,189 @@ class SupabaseClient:
         result = self.client.table("interviews").delete().eq("interview_id", interview_id).execute()
         return len(result.data) > 0
     
-    def get_interview_stats(self) -> Dict[str, Any]:
+    def get_interview_stats(self, approximate: bool = False) -> Dict[str, Any]:
         """
         Get database statistics.
         
+        Args:
+            approximate: Use planner row estimates instead of exact counts
+                (O(1), but only as fresh as the last ANALYZE)
+        
         Returns:
             Dictionary with counts and stats
         """
-        interviews = self.client.table("interviews").select("interview_id", count="exact").execute()
-        segments = self.client.table("segments").select("segment_id", count="exact").execute()
+        result = self.client.rpc("interview_stats", {"approximate": approximate}).execute()
+        return result.data[0]
+
+
+class AsyncSupabaseClient:
+    """
+    Async wrapper for Supabase read/search operations.
+    
+    The underlying client is created asynchronously, so construct with
+    `await AsyncSupabaseClient.create()` or `await get_async_supabase_client()`.
+    """
+    
+    def __init__(self, client: AsyncClient):
+        """Wrap an already-created async Supabase client."""
+        self.client: AsyncClient = client
+        self._rpc_session = client.postgrest.session
+    
+    async def _post_rpc(self, function: str, params: Dict[str, Any]) -> Any:
+        """Async version of SupabaseClient._post_rpc."""
+        response = await self._rpc_session.post(
+            f"/rpc/{function}", content=orjson.dumps(params), headers=JSON_HEADERS
+        )
+        if not response.is_success:
+            raise _rpc_error(response)
+        return orjson.loads(response.content)
+    
+    @classmethod
+    async def create(cls) -> "AsyncSupabaseClient":
+        """Create an async client from environment credentials."""
+        url, key = _credentials()
+        client = await acreate_client(
+            url,
+            key,
+            options=AsyncClientOptions(
+                httpx_client=httpx.AsyncClient(
+                    http2=True, limits=HTTP_LIMITS, timeout=POSTGREST_TIMEOUT
+                ),
+                schema="public"
+            )
+        )
+        return cls(client)
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections; the client is unusable afterwards."""
+        await self._rpc_session.aclose()
+    
+    async def semantic_search(
+        self,
+        query_embedding: List[float],
+        match_threshold: float = 0.3,
+        match_count: int = 10,
+        filter_interview_id: Optional[str] = None,
+        filter_speaker_role: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Async version of SupabaseClient.semantic_search."""
+        return await self._post_rpc(
+            *_semantic_search_rpc(
+                query_embedding, match_threshold, match_count,
+                filter_interview_id, filter_speaker_role, ef_search, probes
+            )
+        )
+    
+    async def batch_semantic_search(
+        self,
+        query_embeddings: List[List[float]],
+        **kwargs: Any
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several semantic searches concurrently.
+        
+        Args:
+            query_embeddings: One query vector per search
+            **kwargs: Passed through to semantic_search
+            
+        Returns:
+            One result list per query, in input order
+        """
+        return await asyncio.gather(
+            *[self.semantic_search(q, **kwargs) for q in query_embeddings]
+        )
+    
+    async def hybrid_search(
+        self,
+        query_embedding: List[float],
+        query_text: str,
+        semantic_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        match_count: int = 10,
+        filter_interview_id: Optional[str] = None,
+        filter_speaker_role: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        rrf_k: int = 60
+    ) -> List[Dict[str, Any]]:
+        """Async version of SupabaseClient.hybrid_search."""
+        return await self._post_rpc(
+            *_hybrid_search_rpc(
+                query_embedding, query_text, semantic_weight, keyword_weight,
+                match_count, filter_interview_id, filter_speaker_role, ef_search, probes,
+                rrf_k
+            )
+        )
+    
+    async def get_segments_by_interview(
+        self,
+        interview_id: str,
+        speaker_role: Optional[str] = None,
+        columns: str = SEGMENT_COLUMNS
+    ) -> List[Dict[str, Any]]:
+        """Async version of SupabaseClient.get_segments_by_interview."""
+        query = self.client.table("segments").select(columns).eq("interview_id", interview_id)
+        
+        if speaker_role:
+            query = query.eq("speaker_role", speaker_role)
         
-        return {
-            "total_interviews": interviews.count,
-            "total_segments": segments.count
-        }
+        result = await query.order("start_time").execute()
+        return result.data
+    
+    async def get_interview_stats(self, approximate: bool = False) -> Dict[str, Any]:
+        """Async version of SupabaseClient.get_interview_stats."""
+        result = await self.client.rpc("interview_stats", {"approximate": approximate}).execute()
+        return result.data[0]
 
 
 # Singleton instance
 _supabase_client: Optional[SupabaseClient] = None
+_client_lock = threading.Lock()
 
 def get_supabase_client() -> SupabaseClient:
-    """Get singleton Supabase client instance."""
+    """
+    Get singleton Supabase client instance.
+    
+    Thread-safe: construction is guarded by a lock so concurrent first calls
+    share one client (and its HTTP pool). functools.lru_cache is not used
+    because it may call the factory more than once under concurrency.
+    """
     global _supabase_client
     if _supabase_client is None:
-        _supabase_client = SupabaseClient()
+        with _client_lock:
+            if _supabase_client is None:
+                _supabase_client = SupabaseClient()
     return _supabase_client
+
+
+# Async client per event loop: the underlying httpx.AsyncClient pool is bound
+# to the loop it first ran on and breaks if reused from another one (e.g.
+# pytest-asyncio creates a loop per test). Entries for closed loops are
+# pruned whenever a new loop asks for a client.
+_async_supabase_clients: Dict[asyncio.AbstractEventLoop, AsyncSupabaseClient] = {}
+_async_client_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+async def get_async_supabase_client() -> AsyncSupabaseClient:
+    """Get the async Supabase client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_supabase_clients.get(loop)
+    if client is not None:
+        return client
+    
+    for closed in [other for other in _async_client_locks if other.is_closed()]:
+        _async_client_locks.pop(closed)
+        _async_supabase_clients.pop(closed, None)
+    lock = _async_client_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        if loop not in _async_supabase_clients:
+            _async_supabase_clients[loop] = await AsyncSupabaseClient.create()
+    return _async_supabase_clients[loop]
+
+
+async def close_async_supabase_client() -> None:
+    """Close and forget the running event loop's async client, if any."""
+    client = _async_supabase_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
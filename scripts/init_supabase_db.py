@@ -7,6 +7,8 @@ This script creates:
 - Vector search functions (for semantic + hybrid search)
 """
 
+import argparse
+import math
 import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -23,6 +25,14 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
 # Initialize Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
+# Default HNSW build parameters (tuned for 100K+ segments)
+HNSW_M = 24
+HNSW_EF_CONSTRUCTION = 128
+HNSW_EF_SEARCH = 100
+
+# IVFFlat list count when the segment count is unknown
+IVFFLAT_DEFAULT_LISTS = 100
+
 
 def enable_pgvector():
     """Enable pgvector extension."""
@@ -60,11 +70,12 @@ def create_tables():
         start_time FLOAT NOT NULL,
         end_time FLOAT NOT NULL,
         text TEXT NOT NULL,
-        embedding vector(768),
+        embedding halfvec(768),
         confidence FLOAT,
         ingestion_mode VARCHAR CHECK (ingestion_mode IN ('OFFLINE', 'LIVE')),
         created_at TIMESTAMP DEFAULT NOW(),
         metadata JSONB,
+        text_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', text)) STORED,
         CONSTRAINT valid_time_range CHECK (end_time > start_time)
     );
     """
@@ -104,37 +115,155 @@ def create_tables():
             print(f"✗ Error: {e}")
 
 
-def create_indexes():
-    """Create performance indexes."""
+def auto_configure_hnsw(vector_count):
+    """
+    Pick HNSW build/query parameters for the expected number of segments.
+
+    Args:
+        vector_count: Expected number of embedded segments
+
+    Returns:
+        Dictionary with m, ef_construction and ef_search
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 100, "ef_search": 100}
+    return {"m": 32, "ef_construction": 128, "ef_search": 200}
+
+
+def choose_index(vector_count):
+    """
+    Pick the vector index type for the expected number of segments.
+
+    IVFFlat builds far faster and uses less memory than HNSW past ~1M rows,
+    at the cost of some recall (tune with ivfflat.probes at query time).
+    """
+    return "ivfflat" if vector_count > 1_000_000 else "hnsw"
+
+
+def create_migrations():
+    """Migrate an existing deployment to the current schema."""
+    
+    migrations = [
+        # Rebuilt by create_indexes() with the halfvec inner-product opclass
+        "DROP INDEX IF EXISTS idx_segments_embedding;",
+        """
+        ALTER TABLE segments
+        ALTER COLUMN embedding TYPE halfvec(768) USING embedding::halfvec(768);
+        """,
+        # Inner-product search expects unit-length embeddings
+        "UPDATE segments SET embedding = l2_normalize(embedding) WHERE embedding IS NOT NULL;",
+        # Old signatures take vector(768); CREATE OR REPLACE would only overload them
+        "DROP FUNCTION IF EXISTS search_segments(vector, float, int, varchar, varchar);",
+        "DROP FUNCTION IF EXISTS hybrid_search_segments(vector, text, float, float, int, varchar, varchar);",
+        # Superseded by idx_segments_interview_time
+        "DROP INDEX IF EXISTS idx_segments_interview;",
+        "DROP INDEX IF EXISTS idx_segments_time;",
+        # Replaced by idx_segments_created_brin
+        "DROP INDEX IF EXISTS idx_segments_created;",
+        # Lexemes are computed once at write time; the GIN index moves to the column
+        """
+        ALTER TABLE segments ADD COLUMN IF NOT EXISTS text_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', text)) STORED;
+        """,
+        "DROP INDEX IF EXISTS idx_segments_text_search;",
+    ]
+    
+    print("\nMigrating existing database (skip on a fresh install)...")
+    for sql in migrations:
+        print(f"Execute: {sql.strip()}")
+
+
+def create_indexes(vector_count=None, index_type=None):
+    """
+    Create performance indexes.
+
+    Args:
+        vector_count: Expected number of segments, used to size the vector
+            index. Defaults to HNSW with m=24, ef_construction=128 when not given.
+        index_type: "hnsw" or "ivfflat"; chosen with choose_index() when not given
+    """
+    if index_type is None:
+        index_type = choose_index(vector_count) if vector_count is not None else "hnsw"
+    
+    if index_type == "hnsw":
+        if vector_count is None:
+            hnsw = {
+                "m": HNSW_M,
+                "ef_construction": HNSW_EF_CONSTRUCTION,
+                "ef_search": HNSW_EF_SEARCH
+            }
+        else:
+            hnsw = auto_configure_hnsw(vector_count)
+        index_method = f"""USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = {hnsw["m"]}, ef_construction = {hnsw["ef_construction"]})"""
+        # Default query-time candidate list to match the graph size;
+        # per-call ef_search still overrides it
+        search_settings = [
+            f"ALTER DATABASE postgres SET hnsw.ef_search = {hnsw['ef_search']};"
+        ]
+    elif index_type == "ivfflat":
+        # Build after loading data: list centroids are sampled from existing rows
+        lists = max(int(math.sqrt(vector_count)), 1) if vector_count else IVFFLAT_DEFAULT_LISTS
+        index_method = f"""USING ivfflat (embedding halfvec_ip_ops)
+        WITH (lists = {lists})"""
+        search_settings = []
+    else:
+        raise ValueError(f"Unknown index_type: {index_type}")
     
     indexes = [
-        "CREATE INDEX IF NOT EXISTS idx_segments_interview ON segments(interview_id);",
+        # Per-interview transcript reads come back already ordered by
+        # start_time with no sort step; rows (including text) are still read
+        # from the heap, so there is no INCLUDE list. The leading column also
+        # serves the ON DELETE CASCADE lookup, e.g.
+        #   EXPLAIN DELETE FROM interviews WHERE interview_id = '...';
+        # plans a pkey scan on interviews, and the FK trigger then finds child
+        # rows via "Index Scan using idx_segments_interview_time on segments"
+        "CREATE INDEX IF NOT EXISTS idx_segments_interview_time ON segments(interview_id, start_time);",
         "CREATE INDEX IF NOT EXISTS idx_segments_speaker ON segments(speaker_role);",
-        "CREATE INDEX IF NOT EXISTS idx_segments_time ON segments(start_time, end_time);",
         "CREATE INDEX IF NOT EXISTS idx_segments_mode ON segments(ingestion_mode);",
-        "CREATE INDEX IF NOT EXISTS idx_segments_created ON segments(created_at);",
+        # Segments are appended in time order, so a BRIN index serves
+        # created_at range scans (retention jobs) at a fraction of a B-tree's size
         """
+        CREATE INDEX IF NOT EXISTS idx_segments_created_brin ON segments
+        USING brin(created_at) WITH (pages_per_range = 32);
+        """,
+        # Give the vector index build enough memory to stay in RAM and let
+        # pgvector 0.6+ build it with parallel workers
+        "SET maintenance_work_mem = '2GB';",
+        "SET max_parallel_maintenance_workers = 7;",
+        f"""
         CREATE INDEX IF NOT EXISTS idx_segments_embedding ON segments 
-        USING hnsw (embedding vector_cosine_ops)
-        WITH (m = 16, ef_construction = 64);
+        {index_method};
         """,
+        # pgvector 0.8+: keep scanning the vector index until filtered queries
+        # have enough rows instead of returning a short top-N (stage 2 re-sorts
+        # by distance, so relaxed ordering is safe). Takes effect on new
+        # connections; skip on older pgvector.
+        "ALTER DATABASE postgres SET hnsw.iterative_scan = 'relaxed_order';",
+        "ALTER DATABASE postgres SET ivfflat.iterative_scan = 'relaxed_order';",
+        *search_settings,
         """
         CREATE INDEX IF NOT EXISTS idx_segments_text_search ON segments 
-        USING gin(to_tsvector('english', text));
+        USING gin(text_tsv);
         """
     ]
     
     print("\nCreating indexes...")
     for idx_sql in indexes:
-        print(f"Execute: {idx_sql[:50]}...")
+        print(f"Execute: {idx_sql.strip()}")
+    
+    if index_type == "ivfflat":
+        print("Note: pass probes to the search functions (ivfflat.probes, ~sqrt(lists))")
 
 
 def create_search_functions():
-    """Create vector search functions."""
+    """Create vector search and bulk insert functions."""
     
     semantic_search = """
     CREATE OR REPLACE FUNCTION search_segments(
-        query_embedding vector(768),
+        query_embedding halfvec(768),
         match_threshold float DEFAULT 0.3,
         match_count int DEFAULT 10,
         filter_interview_id varchar DEFAULT NULL,
@@ -149,38 +278,80 @@ def create_search_functions():
         text text,
         similarity float
     )
-    LANGUAGE plpgsql
+    LANGUAGE sql STABLE PARALLEL SAFE
     AS $$
-    BEGIN
-        RETURN QUERY
+        -- Embeddings are unit-normalized by the client, so the negated inner
+        -- product (<#>) ranks exactly like cosine distance at lower cost.
+        -- Stage 1 picks candidates in one of two mutually exclusive branches
+        -- (the IS NULL guard becomes a one-time filter, so only one runs):
+        --   * no interview filter: ORDER BY ... LIMIT over the embedding, so
+        --     the planner probes the vector index (with hnsw.iterative_scan,
+        --     pgvector 0.8+ keeps walking until the speaker filter is met)
+        --   * one interview: exact scan of that interview's rows through
+        --     idx_segments_interview_time; "+ 0" stops the planner from
+        --     ordering by the vector index, which would only see the global
+        --     top-N and drop most of the interview's segments
+        -- Stage 2 applies the similarity threshold and final limit.
+        WITH candidates AS (
+            (
+                SELECT 
+                    s.segment_id,
+                    s.interview_id,
+                    s.speaker_role,
+                    s.start_time,
+                    s.end_time,
+                    s.text,
+                    s.embedding <#> query_embedding as dist
+                FROM segments s
+                WHERE 
+                    filter_interview_id IS NULL
+                    AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
+                ORDER BY s.embedding <#> query_embedding
+                LIMIT match_count * 4
+            )
+            UNION ALL
+            (
+                SELECT 
+                    s.segment_id,
+                    s.interview_id,
+                    s.speaker_role,
+                    s.start_time,
+                    s.end_time,
+                    s.text,
+                    s.embedding <#> query_embedding as dist
+                FROM segments s
+                WHERE 
+                    s.interview_id = filter_interview_id
+                    AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
+                ORDER BY (s.embedding <#> query_embedding) + 0
+                LIMIT match_count * 4
+            )
+        )
         SELECT 
-            s.segment_id,
-            s.interview_id,
-            s.speaker_role,
-            s.start_time,
-            s.end_time,
-            s.text,
-            1 - (s.embedding <=> query_embedding) as similarity
-        FROM segments s
-        WHERE 
-            (filter_interview_id IS NULL OR s.interview_id = filter_interview_id)
-            AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
-            AND 1 - (s.embedding <=> query_embedding) > match_threshold
-        ORDER BY s.embedding <=> query_embedding
+            c.segment_id,
+            c.interview_id,
+            c.speaker_role,
+            c.start_time,
+            c.end_time,
+            c.text,
+            -c.dist as similarity
+        FROM candidates c
+        WHERE -c.dist > match_threshold
+        ORDER BY c.dist
         LIMIT match_count;
-    END;
     $$;
     """
     
     hybrid_search = """
     CREATE OR REPLACE FUNCTION hybrid_search_segments(
-        query_embedding vector(768),
+        query_embedding halfvec(768),
         query_text text,
         semantic_weight float DEFAULT 0.7,
         keyword_weight float DEFAULT 0.3,
         match_count int DEFAULT 10,
         filter_interview_id varchar DEFAULT NULL,
-        filter_speaker_role varchar DEFAULT NULL
+        filter_speaker_role varchar DEFAULT NULL,
+        rrf_k int DEFAULT 60
     )
     RETURNS TABLE (
         segment_id uuid,
@@ -193,11 +364,15 @@ def create_search_functions():
         keyword_score float,
         combined_score float
     )
-    LANGUAGE plpgsql
+    LANGUAGE sql STABLE PARALLEL SAFE
     AS $$
-    BEGIN
-        RETURN QUERY
-        WITH semantic_results AS (
+        -- Filters live in one place (base). NOT MATERIALIZED lets Postgres
+        -- inline base into each branch instead of scanning segments into a
+        -- temporary result, so the vector and GIN indexes stay usable.
+        -- Semantic candidates use the same two branches as search_segments:
+        -- a vector index probe without an interview filter, an exact scan
+        -- of the interview's rows with one.
+        WITH base AS NOT MATERIALIZED (
             SELECT 
                 s.segment_id,
                 s.interview_id,
@@ -205,48 +380,335 @@ def create_search_functions():
                 s.start_time,
                 s.end_time,
                 s.text,
-                1 - (s.embedding <=> query_embedding) as sem_score
+                s.text_tsv
             FROM segments s
             WHERE 
                 (filter_interview_id IS NULL OR s.interview_id = filter_interview_id)
                 AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
         ),
+        semantic_candidates AS (
+            (
+                SELECT 
+                    s.segment_id,
+                    s.embedding <#> query_embedding as dist
+                FROM segments s
+                WHERE 
+                    filter_interview_id IS NULL
+                    AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
+                ORDER BY s.embedding <#> query_embedding
+                LIMIT match_count * 4
+            )
+            UNION ALL
+            (
+                SELECT 
+                    s.segment_id,
+                    s.embedding <#> query_embedding as dist
+                FROM segments s
+                WHERE 
+                    s.interview_id = filter_interview_id
+                    AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
+                ORDER BY (s.embedding <#> query_embedding) + 0
+                LIMIT match_count * 4
+            )
+        ),
+        semantic_results AS (
+            SELECT 
+                b.*,
+                -c.dist as sem_score,
+                ROW_NUMBER() OVER (ORDER BY c.dist) as sem_rank
+            FROM semantic_candidates c
+            JOIN base b ON b.segment_id = c.segment_id
+        ),
         keyword_results AS (
             SELECT 
-                s.segment_id,
-                ts_rank(to_tsvector('english', s.text), plainto_tsquery('english', query_text)) as kw_score
-            FROM segments s
-            WHERE 
-                (filter_interview_id IS NULL OR s.interview_id = filter_interview_id)
-                AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
-                AND to_tsvector('english', s.text) @@ plainto_tsquery('english', query_text)
+                k.*,
+                ROW_NUMBER() OVER (ORDER BY k.kw_score DESC) as kw_rank
+            FROM (
+                SELECT 
+                    b.*,
+                    ts_rank(b.text_tsv, plainto_tsquery('english', query_text))::float as kw_score
+                FROM base b
+                WHERE b.text_tsv @@ plainto_tsquery('english', query_text)
+                ORDER BY kw_score DESC
+                LIMIT match_count * 4
+            ) k
         )
+        -- Reciprocal Rank Fusion: 1/(k + rank) per retriever, so cosine
+        -- similarity and ts_rank never need to share a scale
         SELECT 
-            sr.segment_id,
-            sr.interview_id,
-            sr.speaker_role,
-            sr.start_time,
-            sr.end_time,
-            sr.text,
-            sr.sem_score,
-            COALESCE(kr.kw_score, 0.0) as kw_score,
-            (semantic_weight * sr.sem_score + keyword_weight * COALESCE(kr.kw_score, 0.0)) as combined
+            COALESCE(sr.segment_id, kr.segment_id),
+            COALESCE(sr.interview_id, kr.interview_id),
+            COALESCE(sr.speaker_role, kr.speaker_role),
+            COALESCE(sr.start_time, kr.start_time),
+            COALESCE(sr.end_time, kr.end_time),
+            COALESCE(sr.text, kr.text),
+            COALESCE(sr.sem_score, 0.0)::float,
+            COALESCE(kr.kw_score, 0.0)::float,
+            (
+                semantic_weight * COALESCE(1.0 / (rrf_k + sr.sem_rank), 0.0)
+                + keyword_weight * COALESCE(1.0 / (rrf_k + kr.kw_rank), 0.0)
+            )::float as rrf_score
         FROM semantic_results sr
-        LEFT JOIN keyword_results kr ON sr.segment_id = kr.segment_id
-        ORDER BY combined DESC
+        FULL OUTER JOIN keyword_results kr ON sr.segment_id = kr.segment_id
+        ORDER BY rrf_score DESC
         LIMIT match_count;
+    $$;
+    """
+    
+    # search_segments/hybrid_search_segments are single-statement SQL
+    # functions, which skips plpgsql's per-call interpreter and cached
+    # generic plans. PostgREST still binds the arguments as parameters, so
+    # this does not constant-fold the NULL filter checks. Setting
+    # ef_search/probes needs a statement of its own, so the knobs live in
+    # these thin plpgsql wrappers.
+    semantic_search_tuned = """
+    CREATE OR REPLACE FUNCTION search_segments_tuned(
+        query_embedding halfvec(768),
+        match_threshold float DEFAULT 0.3,
+        match_count int DEFAULT 10,
+        filter_interview_id varchar DEFAULT NULL,
+        filter_speaker_role varchar DEFAULT NULL,
+        ef_search int DEFAULT NULL,
+        probes int DEFAULT NULL
+    )
+    RETURNS TABLE (
+        segment_id uuid,
+        interview_id varchar,
+        speaker_role varchar,
+        start_time float,
+        end_time float,
+        text text,
+        similarity float
+    )
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        -- Scoped to the RPC's transaction (is_local = true)
+        IF ef_search IS NOT NULL THEN
+            PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+        END IF;
+        IF probes IS NOT NULL THEN
+            PERFORM set_config('ivfflat.probes', probes::text, true);
+        END IF;
+
+        RETURN QUERY
+        SELECT * FROM search_segments(
+            query_embedding, match_threshold, match_count,
+            filter_interview_id, filter_speaker_role
+        );
+    END;
+    $$;
+    """
+    
+    hybrid_search_tuned = """
+    CREATE OR REPLACE FUNCTION hybrid_search_segments_tuned(
+        query_embedding halfvec(768),
+        query_text text,
+        semantic_weight float DEFAULT 0.7,
+        keyword_weight float DEFAULT 0.3,
+        match_count int DEFAULT 10,
+        filter_interview_id varchar DEFAULT NULL,
+        filter_speaker_role varchar DEFAULT NULL,
+        ef_search int DEFAULT NULL,
+        probes int DEFAULT NULL,
+        rrf_k int DEFAULT 60
+    )
+    RETURNS TABLE (
+        segment_id uuid,
+        interview_id varchar,
+        speaker_role varchar,
+        start_time float,
+        end_time float,
+        text text,
+        semantic_score float,
+        keyword_score float,
+        combined_score float
+    )
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        -- Scoped to the RPC's transaction (is_local = true)
+        IF ef_search IS NOT NULL THEN
+            PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+        END IF;
+        IF probes IS NOT NULL THEN
+            PERFORM set_config('ivfflat.probes', probes::text, true);
+        END IF;
+
+        RETURN QUERY
+        SELECT * FROM hybrid_search_segments(
+            query_embedding, query_text, semantic_weight, keyword_weight,
+            match_count, filter_interview_id, filter_speaker_role, rrf_k
+        );
     END;
     $$;
     """
     
+    # Many query vectors in one round trip (evaluation loops). Queries arrive
+    # as pgvector text literals; query_index is 0-based into the input array.
+    batch_search = """
+    CREATE OR REPLACE FUNCTION search_segments_batch(
+        query_embeddings text[],
+        match_threshold float DEFAULT 0.3,
+        match_count int DEFAULT 10,
+        filter_interview_id varchar DEFAULT NULL,
+        filter_speaker_role varchar DEFAULT NULL
+    )
+    RETURNS TABLE (
+        query_index int,
+        segment_id uuid,
+        interview_id varchar,
+        speaker_role varchar,
+        start_time float,
+        end_time float,
+        text text,
+        similarity float
+    )
+    LANGUAGE sql STABLE PARALLEL SAFE
+    AS $$
+        SELECT 
+            r.query_index,
+            r.segment_id,
+            r.interview_id,
+            r.speaker_role,
+            r.start_time,
+            r.end_time,
+            r.text,
+            -r.dist
+        FROM (
+            SELECT 
+                (u.qi - 1)::int as query_index,
+                c.*,
+                ROW_NUMBER() OVER (PARTITION BY u.qi ORDER BY c.dist) as rn
+            FROM unnest(query_embeddings::halfvec(768)[]) WITH ORDINALITY AS u(q, qi)
+            CROSS JOIN LATERAL (
+                -- Same candidate branches as search_segments
+                (
+                    SELECT 
+                        s.segment_id,
+                        s.interview_id,
+                        s.speaker_role,
+                        s.start_time,
+                        s.end_time,
+                        s.text,
+                        s.embedding <#> u.q as dist
+                    FROM segments s
+                    WHERE 
+                        filter_interview_id IS NULL
+                        AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
+                    ORDER BY s.embedding <#> u.q
+                    LIMIT match_count * 4
+                )
+                UNION ALL
+                (
+                    SELECT 
+                        s.segment_id,
+                        s.interview_id,
+                        s.speaker_role,
+                        s.start_time,
+                        s.end_time,
+                        s.text,
+                        s.embedding <#> u.q as dist
+                    FROM segments s
+                    WHERE 
+                        s.interview_id = filter_interview_id
+                        AND (filter_speaker_role IS NULL OR s.speaker_role = filter_speaker_role)
+                    ORDER BY (s.embedding <#> u.q) + 0
+                    LIMIT match_count * 4
+                )
+            ) c
+            WHERE -c.dist > match_threshold
+        ) r
+        WHERE r.rn <= match_count
+        ORDER BY r.query_index, r.rn;
+    $$;
+    """
+    
+    # One multi-row INSERT per batch instead of PostgREST's per-row JSON path.
+    # Embeddings arrive as pgvector text literals ('[0.1,0.2,...]').
+    bulk_insert = """
+    CREATE OR REPLACE FUNCTION insert_segments_bulk(
+        interview_ids varchar[],
+        speaker_roles varchar[],
+        start_times float[],
+        end_times float[],
+        texts text[],
+        embeddings text[],
+        confidences float[],
+        ingestion_modes varchar[],
+        metadatas jsonb[]
+    )
+    RETURNS int
+    LANGUAGE sql
+    AS $$
+        WITH inserted AS (
+            INSERT INTO segments (
+                interview_id, speaker_role, start_time, end_time, text,
+                embedding, confidence, ingestion_mode, metadata
+            )
+            SELECT * FROM unnest(
+                interview_ids, speaker_roles, start_times, end_times, texts,
+                embeddings::halfvec(768)[], confidences, ingestion_modes, metadatas
+            )
+            RETURNING 1
+        )
+        SELECT count(*)::int FROM inserted;
+    $$;
+    """
+    
+    # Both counts in one round trip; approximate=true reads planner
+    # statistics (pg_class.reltuples) instead of scanning the tables.
+    # reltuples is -1 until the table is first analyzed (PG14+), so clamp it
+    interview_stats = """
+    CREATE OR REPLACE FUNCTION interview_stats(approximate boolean DEFAULT false)
+    RETURNS TABLE (total_interviews bigint, total_segments bigint)
+    LANGUAGE sql STABLE
+    AS $$
+        SELECT
+            CASE WHEN approximate
+                THEN (SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'interviews'::regclass)
+                ELSE (SELECT count(*) FROM interviews)
+            END,
+            CASE WHEN approximate
+                THEN (SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'segments'::regclass)
+                ELSE (SELECT count(*) FROM segments)
+            END;
+    $$;
+    """
+    
     print("\nCreating search functions...")
     print("Execute these in Supabase SQL Editor:")
     print(semantic_search)
     print(hybrid_search)
+    print(semantic_search_tuned)
+    print(hybrid_search_tuned)
+    print(batch_search)
+    print(bulk_insert)
+    print(interview_stats)
+
+
+def parse_args():
+    """Parse command-line options for sizing the vector index."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--vector-count",
+        type=int,
+        default=None,
+        help="Expected number of segments; sizes HNSW/IVFFlat parameters"
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=["hnsw", "ivfflat"],
+        default=None,
+        help="Vector index type (default: chosen from --vector-count, else hnsw)"
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main initialization flow."""
+    args = parse_args()
+    
     print("=" * 60)
     print("Supabase Database Initialization")
     print("=" * 60)
@@ -259,7 +721,8 @@ def main():
     
     enable_pgvector()
     create_tables()
-    create_indexes()
+    create_migrations()
+    create_indexes(vector_count=args.vector_count, index_type=args.index_type)
     create_search_functions()
     
     print("\n" + "=" * 60)